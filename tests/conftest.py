@@ -29,11 +29,20 @@ def pytest_configure(config):
     config.addinivalue_line("markers", "flask: custom marker for flask server tests.")
     config.addinivalue_line("markers", "git: custom marker for git tests.")
     config.addinivalue_line("markers", "make: custom marker for Makefile tests.")
+    config.addinivalue_line(
+        "markers", "make_probe: make probe (target, dry_mode, extra_args) of a test."
+    )
     config.addinivalue_line("markers", "schema: custom marker for schema tests.")
     config.addinivalue_line("markers", "utils: custom marker for utility tests.")
     config.addinivalue_line("markers", "website: custom marker for website tests.")
 
 
+@pytest.hookimpl(optionalhook=True)
+def pytest_configure_node(node):
+    """For passing the xdist distribution mode on to worker processes."""
+    node.workerinput["dist"] = node.config.getoption("dist")
+
+
 def get_server_info() -> Tuple[int, str]:
     """Convenience function to get test server port and submit route."""
     return TEST_SERVER_INFO["port"], TEST_SERVER_INFO["submit_route"]
@@ -1,83 +1,213 @@
 """Tests for Makefile."""
 
+import configparser
+import os
 import shutil
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from functools import lru_cache
 from pathlib import Path
 from typing import Any
 from typing import Dict
 from typing import List
+from typing import NamedTuple
 from typing import Optional
+from typing import Sequence
 from typing import Tuple
 
 import pytest
 from pytest import MonkeyPatch
 
+from tests.data_structures import ImmutableDict
 
-def get_source_makefile_path() -> Path:
-    """Dynamically get the path to the source Makefile."""
-    # start from the current file's directory
-    current_dir = Path(__file__).resolve().parent
 
-    # traverse upwards until you the 'Makefile' (assumed repo root)
-    while current_dir.parent != current_dir:
-        if (current_dir / "Makefile").exists():
-            return current_dir  # found the source repository
-        current_dir = current_dir.parent
+# keep the module on one xdist worker (with --dist loadgroup) so cached make
+# results and session fixtures are only computed once
+pytestmark = pytest.mark.xdist_group("make")
 
-    # coudln't find it
-    raise FileNotFoundError("Could not find the Makefile in the source repository.")
+# absolute path to make (lets subprocess use posix_spawn instead of fork/exec)
+MAKE = shutil.which("make") or ""
 
+# fail fast instead of spawning dozens of doomed make subprocesses
+if not MAKE:
+    pytest.skip("make is not installed or not found in PATH", allow_module_level=True)
 
-@lru_cache(maxsize=1)
-def get_cached_makefile_path() -> Path:
-    """Retrieves and caches path to the Makefile in source repository."""
-    return get_source_makefile_path() / "Makefile"
+# path to the Makefile at the root of the source repository
+MAKEFILE_PATH = Path(__file__).resolve().parent.parent / "Makefile"
+assert MAKEFILE_PATH.exists(), f"Could not find the source Makefile: {MAKEFILE_PATH}"
 
+# variables the Makefile lets the environment override (?=) in print-config
+PRINT_CONFIG_ENV_OVERRIDES = ("REPO_NAME", "GIT_BRANCH", "DCKRTAG", "DCKRIMG")
 
-def run_make(
-    target: str,
-    dry_mode: bool = False,
-    extra_args: Optional[List[str]] = None,
-    cwd: Optional[Path] = None,
-    makefile_path: Optional[Path] = None,
-) -> subprocess.CompletedProcess[str]:
-    """Runs a Makefile target."""
-    # default to source repo Makefile path if not provided
-    if makefile_path is None:
-        makefile_path = get_cached_makefile_path()
+# pytest cache key for the print-config output
+PRINT_CONFIG_CACHE_KEY = "makefile/print-config"
+
+# remote URLs used to test GitHub username extraction
+GITHUB_HTTPS_REMOTE_URL = "https://github.com/User_Name/repo_name"
+GITHUB_SSH_REMOTE_URL = "git@github.com:User_Name/repo_name.git"
+INVALID_REMOTE_URL = "foo://bar@github.com/user/repo.git"
+
+# placeholder Makefile path for tests that mock out subprocess.run
+FAKE_MAKEFILE_PATH = Path("/dev/null/Makefile")
+
+# seconds to wait on git subprocesses before giving up
+GIT_TIMEOUT = 5
+
+# env vars that change which config git reads (GIT_CONFIG_COUNT backs `-c`)
+GIT_CONFIG_ENV_OVERRIDES = (
+    "GIT_DIR",
+    "GIT_CONFIG",
+    "GIT_CONFIG_COUNT",
+    "GIT_CONFIG_PARAMETERS",
+)
+
+# characters git treats as quoting, escapes or comments in config values
+GIT_CONFIG_SPECIAL_CHARS = ('"', "\\", ";", "#")
+
+
+@lru_cache(maxsize=None)
+def make_base_command(makefile_path: Path) -> Tuple[str, ...]:
+    """Builds and caches the make argv prefix for a given Makefile."""
+    return (MAKE, "-f", str(makefile_path))
+
+
+class MakeResult(NamedTuple):
+    """Frozen result of a make invocation, safe to share from the cache."""
+
+    returncode: int
+    stdout: bytes
+    stderr: bytes
 
-    # set default cwd to the current working directory if not provided
-    if cwd is None:
-        cwd = Path(".")
 
+@lru_cache(maxsize=None)
+def run_make_cached(
+    target: str,
+    dry_mode: bool,
+    extra_args: Tuple[str, ...],
+    cwd: Optional[Path],
+    makefile_path: Path,
+) -> MakeResult:
+    """Runs a Makefile target once per unique set of arguments."""
     # initial command string
-    command = ["make", "-f", str(makefile_path)]
+    command = list(make_base_command(makefile_path))
 
-    # check for -n flag
+    # check for -n flag (-r skips the implicit rule search for remaking the
+    # Makefile, built-in variables are kept so recipes expand as in real runs)
     if dry_mode:
-        command.append("-n")
+        command.extend(["-r", "-n"])
 
     # add in target command
     command.append(target)
 
     # add any additional args
-    if extra_args:
-        command.extend(extra_args)
-
-    # run process and get output
-    result = subprocess.run(command, cwd=cwd, capture_output=True, text=True)
+    command.extend(extra_args)
+
+    # run process and get raw output (tests only search for short substrings),
+    # a cwd of None is inherited by the child without a chdir
+    result = subprocess.run(
+        command,
+        cwd=cwd,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        preexec_fn=None,
+        close_fds=False,  # safe, fds are non-inheritable by default (PEP 446)
+    )
 
     # done
-    return result
+    return MakeResult(result.returncode, result.stdout, result.stderr)
+
+
+def run_make(
+    target: str,
+    dry_mode: bool = False,
+    extra_args: Optional[List[str]] = None,
+    cwd: Optional[Path] = None,
+    makefile_path: Optional[Path] = None,
+) -> MakeResult:
+    """Runs a Makefile target.
+
+    Results are memoized for the session, so only targets without side effects
+    (dry runs, print-config, etc.) should be run through this helper.
+    """
+    # default to source repo Makefile path if not provided
+    if makefile_path is None:
+        makefile_path = MAKEFILE_PATH
+
+    # repeated probes with the same arguments hit the cache
+    return run_make_cached(
+        target, dry_mode, tuple(extra_args or ()), cwd, makefile_path
+    )
+
+
+def prefetch_make_runs(probes: Sequence[Tuple[str, bool, Tuple[str, ...]]]) -> None:
+    """Run (target, dry_mode, extra_args) probes concurrently to warm the cache."""
+    # subprocess waits release the GIL, so threads overlap the make runs
+    max_workers = max(min(len(probes), os.cpu_count() or 1), 1)
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = [
+            pool.submit(run_make, target, dry_mode, list(extra_args))
+            for target, dry_mode, extra_args in probes
+        ]
+
+        # surface any errors raised while running a probe
+        for future in futures:
+            future.result()
+
+
+def read_git_config_remote_url() -> Optional[str]:
+    """Read the `origin` remote URL directly from the repository's git config.
+
+    Returns None whenever git could resolve the URL differently (environment
+    overrides, includes, quoting, escapes or comments), so callers fall back
+    to asking git itself.
+    """
+    # env vars that redirect or extend the config git would read
+    if any(name in os.environ for name in GIT_CONFIG_ENV_OVERRIDES):
+        return None
+
+    # parse .git/config at the repo root without forking git
+    git_config = configparser.ConfigParser(strict=False, interpolation=None)
+    try:
+        git_config.read(MAKEFILE_PATH.parent / ".git" / "config", encoding="utf-8")
+        remote_url = git_config['remote "origin"']["url"].strip()
+
+    except (configparser.Error, KeyError, UnicodeDecodeError):
+        # missing or unparsable config (e.g. worktrees), defer to git itself
+        return None
+
+    # included files may override the URL
+    if any(
+        section.lower().split(" ", 1)[0] in ("include", "includeif")
+        for section in git_config.sections()
+    ):
+        return None
+
+    # only plain values parse the same way configparser and git do
+    if any(char in remote_url for char in GIT_CONFIG_SPECIAL_CHARS):
+        return None
+
+    return remote_url or None
 
 
+@lru_cache(maxsize=1)
 def get_git_remote_url() -> str:
     """Helper function to get the remote URL of the repository."""
+    # fast path: read the URL straight from .git/config
+    remote_url = read_git_config_remote_url()
+    if remote_url:
+        return remote_url
+
+    # C locale skips git's locale setup, the rest of the env (HOME, GIT_*) is
+    # kept so global config such as safe.directory still applies
+    git_env = {**os.environ, "LC_ALL": "C"}
+
     try:
         # Run git command to get remote URL
         remote_url = subprocess.check_output(
             ["git", "config", "--get", "remote.origin.url"],
+            env=git_env,
+            timeout=GIT_TIMEOUT,
             universal_newlines=True,
         ).strip()
 
@@ -88,18 +218,20 @@ def get_git_remote_url() -> str:
         # normal
         return remote_url
 
-    except subprocess.CalledProcessError:
+    except (subprocess.CalledProcessError, subprocess.TimeoutExpired):
         # Check remotes if 'origin' is missing
         try:
             remotes_list = subprocess.check_output(
                 ["git", "remote", "-v"],
+                env=git_env,
+                timeout=GIT_TIMEOUT,
                 universal_newlines=True,
             ).strip()
 
             # no origin
             return "Missing `origin` remote. " f"Available remotes: {remotes_list}"
 
-        except subprocess.CalledProcessError:
+        except (subprocess.CalledProcessError, subprocess.TimeoutExpired):
             # no git repo
             return (
                 "Error: Unable to fetch remote details. "
@@ -107,31 +239,186 @@ def get_git_remote_url() -> str:
             )
 
 
-@pytest.fixture(scope="function")
-def print_config_output() -> Dict[str, str]:
-    """Fixture to get the output from the print-config target in Makefile."""
+def get_git_dir() -> Optional[Path]:
+    """Resolve the repository's git dir, following `.git` files (worktrees)."""
+    dot_git = MAKEFILE_PATH.parent / ".git"
+    if dot_git.is_dir():
+        return dot_git
+
+    # worktrees and submodules use a `gitdir: <path>` pointer file instead
+    try:
+        pointer = dot_git.read_text(encoding="utf-8").strip()
+    except (OSError, UnicodeDecodeError):
+        return None
+
+    if not pointer.startswith("gitdir:"):
+        return None
+
+    # relative pointers are relative to the directory holding `.git`
+    return dot_git.parent / pointer[len("gitdir:") :].strip()
+
+
+def get_print_config_sources() -> Optional[List[Path]]:
+    """Get the files whose changes invalidate the on-disk print-config cache."""
+    git_dir = get_git_dir()
+    if git_dir is None:
+        return None
+
+    # worktrees keep HEAD locally but share the config of the main repo
+    common_dir = git_dir
+    try:
+        common_dir = git_dir / (git_dir / "commondir").read_text("utf-8").strip()
+    except (OSError, UnicodeDecodeError):
+        pass
+
+    return [MAKEFILE_PATH, git_dir / "HEAD", common_dir / "config"]
+
+
+def get_print_config_cache_key() -> Optional[List[Any]]:
+    """Build the key identifying print-config output across pytest sessions.
+
+    Returns None if a source of the output cannot be located, in which case
+    the output must not be cached.
+    """
+    # output depends on the working dir, both physical and logical (CURRENTDIR
+    # and DCTNR come from `pwd` and $(PWD), which keep symlinks)
+    cache_key: List[Any] = [os.getcwd(), os.environ.get("PWD")]
+
+    # ... on the Makefile, the checked out branch and the remotes
+    sources = get_print_config_sources()
+    if sources is None:
+        return None
+
+    for path in sources:
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        cache_key.append([str(path.resolve()), stat.st_mtime_ns, stat.st_size])
+
+    # ... on any Makefile variable overrides
+    cache_key.extend(os.environ.get(name) for name in PRINT_CONFIG_ENV_OVERRIDES)
+
+    # ... and on env vars changing what the Makefile's git calls return,
+    # including the numbered GIT_CONFIG_KEY_<n>/GIT_CONFIG_VALUE_<n> pairs
+    cache_key.extend(os.environ.get(name) for name in GIT_CONFIG_ENV_OVERRIDES)
+    cache_key.append(
+        sorted(
+            [name, value]
+            for name, value in os.environ.items()
+            if name.startswith(("GIT_CONFIG_KEY_", "GIT_CONFIG_VALUE_"))
+        )
+    )
+
+    return cache_key
+
+
+@pytest.fixture(scope="session")
+def print_config_output(request: pytest.FixtureRequest) -> Dict[str, str]:
+    """Fixture to get the output from the print-config target in Makefile.
+
+    The output is parsed once per session and shared between tests, so it is
+    returned as an ImmutableDict to keep tests from mutating it. It is also
+    stored in the pytest cache and reused by later sessions until the Makefile,
+    git state, working dir or overriding environment variables (Makefile or
+    git config) change.
+    """
+    # cache provider may be disabled (e.g. -p no:cacheprovider), and the git
+    # state may not be resolvable, in both cases always run make
+    cache = getattr(request.config, "cache", None)
+    cache_key = get_print_config_cache_key()
+    if cache_key is None:
+        cache = None
+
+    # reuse output from a previous session if nothing has changed
+    if cache is not None:
+        cached = cache.get(PRINT_CONFIG_CACHE_KEY, None)
+        if cached is not None and cached.get("key") == cache_key:
+            return ImmutableDict(cached["config"])
+
     result = run_make("print-config")
 
     # ensure the command ran successfully
     assert result.returncode == 0
 
-    # parse the output from print-config and store as key-value pairs
-    config_data = {}
-    for line in result.stdout.splitlines():
-        # only process lines with a key-value format (e.g., key: value)
-        if ":" in line:
-            key, value = line.split(":", 1)
-            config_data[key.strip()] = value.strip()
+    # parse the output from print-config and store as key-value pairs, only
+    # lines with a key-value format (e.g., key: value) have a separator
+    config_data = {
+        key.strip(): value.strip()
+        for line in result.stdout.decode("utf-8", "replace").splitlines()
+        for key, sep, value in [line.partition(":")]
+        if sep
+    }
 
-    return config_data
+    # save for later sessions
+    if cache is not None:
+        cache.set(PRINT_CONFIG_CACHE_KEY, {"key": cache_key, "config": config_data})
 
+    return ImmutableDict(config_data)
 
-@pytest.fixture(scope="function")
+
+@pytest.fixture(scope="session")
 def current_directory(print_config_output: Dict[str, str]) -> Path:
     """Fixture to get the current dir from print-config output."""
     return Path(print_config_output["Current Directory"])
 
 
+@pytest.fixture(scope="function")
+def fake_repo_dir(tmp_path: Path, monkeypatch: MonkeyPatch) -> Path:
+    """Fixture to point MAKEFILE_PATH at an empty temporary repository."""
+    # create repo with a Makefile and an empty .git dir
+    repo_dir = tmp_path / "repo"
+    (repo_dir / ".git").mkdir(parents=True)
+    (repo_dir / "Makefile").write_text("all:\n", encoding="utf-8")
+
+    # redirect the module's Makefile path to the fake repo
+    monkeypatch.setattr(f"{__name__}.MAKEFILE_PATH", repo_dir / "Makefile")
+
+    # clear env vars that change which git config is read
+    for name in GIT_CONFIG_ENV_OVERRIDES:
+        monkeypatch.delenv(name, raising=False)
+
+    return repo_dir
+
+
+@pytest.fixture(scope="function")
+def make_probe_result(request: pytest.FixtureRequest) -> MakeResult:
+    """Fixture to get the result of the make probe declared by the test."""
+    marker = request.node.get_closest_marker("make_probe")
+    assert marker is not None, "test is missing a make_probe marker"
+
+    # unpack (target, dry_mode, extra_args) from the marker
+    target, dry_mode, extra_args = marker.args
+    return run_make(target, dry_mode, list(extra_args))
+
+
+@pytest.fixture(scope="module", autouse=True)
+def prefetch_make_probes(request: pytest.FixtureRequest) -> None:
+    """Fixture to run the make probes of all selected tests up front, at once.
+
+    On xdist workers the session holds every collected test, not only those
+    scheduled on the worker, so probes are only prefetched there under
+    `--dist loadgroup`, which schedules this whole module on one worker. With
+    other modes each test runs (and caches) its own probe on demand.
+    """
+    # dist mode is forwarded to workers by pytest_configure_node in conftest
+    workerinput = getattr(request.config, "workerinput", None)
+    if workerinput is not None and workerinput.get("dist") != "loadgroup":
+        return
+
+    # only probes of tests selected for this session (print-config is left to
+    # its on-disk cache)
+    probes = [
+        tuple(marker.args)
+        for item in request.session.items
+        for marker in item.iter_markers("make_probe")
+    ]
+
+    # identical probes only need to run once
+    if probes:
+        prefetch_make_runs(list(dict.fromkeys(probes)))
+
+
 @pytest.mark.git
 def test_git_installed() -> None:
     """Ensure that Git is installed and available."""
@@ -155,6 +442,227 @@ def test_git_remote_url() -> None:
     assert "github.com" in remote_url, f"Expected GitHub URL, but got: {remote_url}"
 
 
+@pytest.mark.git
+@pytest.mark.parametrize(
+    "git_config,expected",
+    [
+        pytest.param(
+            '[remote "origin"]\n\turl = https://github.com/a/b.git\n',
+            "https://github.com/a/b.git",
+            id="plain",
+        ),
+        pytest.param(
+            '[remote "origin"]\n\turl = "https://github.com/a/b.git" ; c\n',
+            None,
+            id="quote-and-comment",
+        ),
+        pytest.param(
+            '[remote "origin"]\n\turl = https://github.com/a/b\\.git\n',
+            None,
+            id="backslash",
+        ),
+        pytest.param(
+            '[remote "origin"]\n\turl = https://github.com/a/b.git # c\n',
+            None,
+            id="hash-comment",
+        ),
+        pytest.param(
+            "[include]\n\tpath = extra\n"
+            '[remote "origin"]\n\turl = https://github.com/a/b.git\n',
+            None,
+            id="include",
+        ),
+        pytest.param(
+            '[includeIf "gitdir:~/work/"]\n\tpath = extra\n'
+            '[remote "origin"]\n\turl = https://github.com/a/b.git\n',
+            None,
+            id="include-if",
+        ),
+        pytest.param(
+            '[remote "upstream"]\n\turl = https://github.com/a/b.git\n',
+            None,
+            id="missing-section",
+        ),
+        pytest.param(None, None, id="missing-file"),
+    ],
+)
+def test_read_git_config_remote_url(
+    fake_repo_dir: Path, git_config: Optional[str], expected: Optional[str]
+) -> None:
+    """Test the fast path only returns URLs it can parse exactly like git."""
+    # write out handwritten git config (if any)
+    if git_config is not None:
+        (fake_repo_dir / ".git" / "config").write_text(git_config, encoding="utf-8")
+
+    assert read_git_config_remote_url() == expected
+
+
+@pytest.mark.git
+@pytest.mark.parametrize("env_var", GIT_CONFIG_ENV_OVERRIDES)
+def test_read_git_config_remote_url_env_override(
+    fake_repo_dir: Path, monkeypatch: MonkeyPatch, env_var: str
+) -> None:
+    """Test the fast path defers to git when the env changes the config read."""
+    # valid config that would otherwise be read directly
+    (fake_repo_dir / ".git" / "config").write_text(
+        '[remote "origin"]\n\turl = https://github.com/a/b.git\n', encoding="utf-8"
+    )
+    monkeypatch.setenv(env_var, "1")
+
+    assert read_git_config_remote_url() is None
+
+
+@pytest.mark.git
+def test_git_remote_url_fallback(fake_repo_dir: Path, monkeypatch: MonkeyPatch) -> None:
+    """Test the git fallback runs with a C locale and a timeout."""
+    calls: List[Dict[str, Any]] = []
+
+    def mock_check_output(command: List[str], **kwargs: Any) -> str:
+        """Mock function for subprocess.check_output recording its arguments."""
+        calls.append(kwargs)
+        return "https://github.com/a/b.git\n"
+
+    # no .git/config in the fake repo, so the fast path falls through to git
+    monkeypatch.setattr(subprocess, "check_output", mock_check_output)
+    monkeypatch.setenv("HOME", "/home/tester")
+
+    # bypass the cache so the fake repo is actually inspected
+    assert get_git_remote_url.__wrapped__() == "https://github.com/a/b.git"
+
+    # check git got a C locale, the rest of the env and a timeout
+    assert len(calls) == 1
+    assert calls[0]["env"]["LC_ALL"] == "C"
+    assert calls[0]["env"]["HOME"] == "/home/tester"
+    assert calls[0]["timeout"] == GIT_TIMEOUT
+
+
+@pytest.mark.git
+@pytest.mark.parametrize(
+    "remotes_timeout,expected",
+    [
+        pytest.param(False, "Missing `origin` remote.", id="remotes-listed"),
+        pytest.param(True, "Error: Unable to fetch remote details.", id="no-remotes"),
+    ],
+)
+def test_git_remote_url_fallback_timeout(
+    fake_repo_dir: Path, monkeypatch: MonkeyPatch, remotes_timeout: bool, expected: str
+) -> None:
+    """Test a git timeout is handled like a failed git command."""
+
+    def mock_check_output(command: List[str], **kwargs: Any) -> str:
+        """Mock function for subprocess.check_output simulating hung git."""
+        # `git remote -v` may answer even if `git config` hangs
+        if command[1] == "remote" and not remotes_timeout:
+            return "upstream\thttps://github.com/a/b.git (fetch)\n"
+        raise subprocess.TimeoutExpired(command, kwargs["timeout"])
+
+    # no .git/config in the fake repo, so the fast path falls through to git
+    monkeypatch.setattr(subprocess, "check_output", mock_check_output)
+
+    # bypass the cache so the fake repo is actually inspected
+    assert get_git_remote_url.__wrapped__().startswith(expected)
+
+
+@pytest.mark.git
+def test_print_config_sources_git_dir(fake_repo_dir: Path) -> None:
+    """Test cache sources are read from a plain `.git` dir."""
+    git_dir = fake_repo_dir / ".git"
+
+    assert get_git_dir() == git_dir
+    assert get_print_config_sources() == [
+        fake_repo_dir / "Makefile",
+        git_dir / "HEAD",
+        git_dir / "config",
+    ]
+
+
+@pytest.mark.git
+def test_print_config_sources_gitdir_pointer(fake_repo_dir: Path) -> None:
+    """Test cache sources follow a worktree `gitdir:` pointer and commondir."""
+    # main repo with a worktree git dir pointing back at the shared config
+    main_git_dir = fake_repo_dir.parent / "main" / ".git"
+    worktree_git_dir = main_git_dir / "worktrees" / "wt"
+    worktree_git_dir.mkdir(parents=True)
+    (worktree_git_dir / "commondir").write_text("../..\n", encoding="utf-8")
+
+    # replace the fake repo's .git dir with a relative pointer file
+    (fake_repo_dir / ".git").rmdir()
+    (fake_repo_dir / ".git").write_text(
+        "gitdir: ../main/.git/worktrees/wt\n", encoding="utf-8"
+    )
+
+    # HEAD is per worktree, the config is shared with the main repo
+    sources = get_print_config_sources()
+    assert sources is not None
+    assert get_git_dir() == fake_repo_dir / "../main/.git/worktrees/wt"
+    assert [path.resolve() for path in sources] == [
+        (fake_repo_dir / "Makefile").resolve(),
+        (worktree_git_dir / "HEAD").resolve(),
+        (main_git_dir / "config").resolve(),
+    ]
+
+
+@pytest.mark.git
+def test_print_config_cache_key_missing_head(fake_repo_dir: Path) -> None:
+    """Test print-config output is not cached when HEAD cannot be stat'ed."""
+    (fake_repo_dir / ".git" / "config").write_text("[core]\n", encoding="utf-8")
+
+    assert get_print_config_cache_key() is None
+
+
+@pytest.mark.git
+def test_print_config_cache_key_missing_git_dir(fake_repo_dir: Path) -> None:
+    """Test print-config output is not cached without a resolvable git dir."""
+    (fake_repo_dir / ".git").rmdir()
+    (fake_repo_dir / ".git").write_text("not a pointer\n", encoding="utf-8")
+
+    assert get_print_config_cache_key() is None
+
+
+@pytest.mark.git
+def test_print_config_cache_key_tracks_git_state(fake_repo_dir: Path) -> None:
+    """Test the cache key changes when HEAD or the git config changes."""
+    git_dir = fake_repo_dir / ".git"
+    (git_dir / "HEAD").write_text("ref: refs/heads/a\n", encoding="utf-8")
+    (git_dir / "config").write_text("[core]\n", encoding="utf-8")
+    initial_key = get_print_config_cache_key()
+    assert initial_key is not None
+
+    # unchanged files give the same key
+    assert get_print_config_cache_key() == initial_key
+
+    # switching branches changes HEAD
+    (git_dir / "HEAD").write_text("ref: refs/heads/other\n", encoding="utf-8")
+    branch_key = get_print_config_cache_key()
+    assert branch_key != initial_key
+
+    # changing remotes changes the config
+    (git_dir / "config").write_text(
+        '[remote "origin"]\n\turl = https://github.com/a/b.git\n', encoding="utf-8"
+    )
+    assert get_print_config_cache_key() not in (initial_key, branch_key)
+
+
+@pytest.mark.git
+@pytest.mark.parametrize(
+    "env_var", ("PWD", "REPO_NAME", "GIT_BRANCH", "GIT_DIR", "GIT_CONFIG_VALUE_0")
+)
+def test_print_config_cache_key_tracks_env(
+    fake_repo_dir: Path, monkeypatch: MonkeyPatch, env_var: str
+) -> None:
+    """Test the cache key changes with env vars that change print-config."""
+    git_dir = fake_repo_dir / ".git"
+    (git_dir / "HEAD").write_text("ref: refs/heads/a\n", encoding="utf-8")
+    (git_dir / "config").write_text("[core]\n", encoding="utf-8")
+
+    # compare keys with the env var at two different values
+    monkeypatch.setenv(env_var, "one")
+    initial_key = get_print_config_cache_key()
+    monkeypatch.setenv(env_var, "two")
+
+    assert get_print_config_cache_key() != initial_key
+
+
 @pytest.mark.git
 @pytest.mark.make
 @pytest.mark.fixture
@@ -188,11 +696,13 @@ def test_github_info_matches_docker_images(print_config_output: Dict[str, str])
 
 @pytest.mark.git
 @pytest.mark.make
-def test_github_user_extraction_https() -> None:
+@pytest.mark.make_probe(
+    "test-github-user", False, (f"REMOTE_URL={GITHUB_HTTPS_REMOTE_URL}",)
+)
+def test_github_user_extraction_https(make_probe_result: MakeResult) -> None:
     """Test GitHub username extraction from HTTPS URL."""
-    # setup url
-    remote_url = "https://github.com/User_Name/repo_name"
-    result = run_make("test-github-user", extra_args=[f"REMOTE_URL={remote_url}"])
+    # output of the make run declared by the test's make_probe marker
+    result = make_probe_result
 
     # check exit value
     assert result.returncode == 0
@@ -201,16 +711,18 @@ def test_github_user_extraction_https() -> None:
     output = result.stdout.strip()
 
     # check user name
-    assert output == "user_name"
+    assert output == b"user_name"
 
 
 @pytest.mark.git
 @pytest.mark.make
-def test_github_user_extraction_ssh() -> None:
+@pytest.mark.make_probe(
+    "test-github-user", False, (f"REMOTE_URL={GITHUB_SSH_REMOTE_URL}",)
+)
+def test_github_user_extraction_ssh(make_probe_result: MakeResult) -> None:
     """Test GitHub username extraction from SSH URL."""
-    # setup url
-    remote_url = "git@github.com:User_Name/repo_name.git"
-    result = run_make("test-github-user", extra_args=[f"REMOTE_URL={remote_url}"])
+    # output of the make run declared by the test's make_probe marker
+    result = make_probe_result
 
     # check exit value
     assert result.returncode == 0
@@ -219,43 +731,46 @@ def test_github_user_extraction_ssh() -> None:
     output = result.stdout.strip()
 
     # check user name
-    assert output == "user_name"
+    assert output == b"user_name"
 
 
 @pytest.mark.git
 @pytest.mark.make
-def test_github_user_extraction_fails() -> None:
+@pytest.mark.make_probe(
+    "test-github-user", False, (f"REMOTE_URL={INVALID_REMOTE_URL}",)
+)
+def test_github_user_extraction_fails(make_probe_result: MakeResult) -> None:
     """Test GitHub username extraction from invalid URL."""
-    # setup url
-    remote_url = "foo://bar@github.com/user/repo.git"
-    result = run_make("test-github-user", extra_args=[f"REMOTE_URL={remote_url}"])
+    # output of the make run declared by the test's make_probe marker
+    result = make_probe_result
 
     # cleaup output
     output = result.stdout.strip()
 
     # error output
-    assert "Invalid" in output
-    assert remote_url in output
+    assert b"Invalid" in output
+    assert INVALID_REMOTE_URL.encode() in output
 
 
 @pytest.mark.make
-def test_run_make_invalid_target() -> None:
+@pytest.mark.make_probe("nonexistent_target", True, ())
+def test_run_make_invalid_target(make_probe_result: MakeResult) -> None:
     """Confirm missing target fails."""
-    # run make on missing target
-    result = run_make("nonexistent_target", dry_mode=True)
+    # output of the make run declared by the test's make_probe marker
+    result = make_probe_result
 
     # check correct error
     assert result.returncode != 0
-    assert "No rule to make target" in result.stderr
+    assert b"No rule to make target" in result.stderr
 
 
 @pytest.mark.make
-def test_run_make_dry_mode(monkeypatch: MonkeyPatch) -> None:
+def test_run_make_dry_mode(monkeypatch: MonkeyPatch, tmp_path: Path) -> None:
     """Test the behavior of `run_make` with dry-run mode enabled."""
 
     def mock_subprocess_run(
         command: List[str], *args: Tuple[Any], **kwargs: Dict[str, Any]
-    ) -> subprocess.CompletedProcess[str]:
+    ) -> subprocess.CompletedProcess[bytes]:
         """Mock function for subprocess.run to simulate command execution."""
         # check that "-n" (dry-run flag) is in the command list
         assert "-n" in command
@@ -264,144 +779,117 @@ def test_run_make_dry_mode(monkeypatch: MonkeyPatch) -> None:
         assert "build" in command
 
         # simulate a successful subprocess result
-        return subprocess.CompletedProcess(command, 0, stdout="", stderr="")
+        return subprocess.CompletedProcess(command, 0, stdout=b"", stderr=b"")
 
     # replace subprocess.run with our mock function during the test
     monkeypatch.setattr(subprocess, "run", mock_subprocess_run)
 
-    # call run_make with dry_mode set to True
-    run_make("build", dry_mode=True)
+    # call run_make with dry_mode set to True (unique cwd bypasses the cache)
+    run_make("build", dry_mode=True, cwd=tmp_path, makefile_path=FAKE_MAKEFILE_PATH)
 
 
 @pytest.mark.make
-def test_run_make_with_extra_args(monkeypatch: MonkeyPatch) -> None:
+def test_run_make_with_extra_args(monkeypatch: MonkeyPatch, tmp_path: Path) -> None:
     """Test the `run_make` function with additional arguments."""
 
     def mock_subprocess_run(
         command: List[str], *args: Tuple[Any], **kwargs: Dict[str, Any]
-    ) -> subprocess.CompletedProcess[str]:
+    ) -> subprocess.CompletedProcess[bytes]:
         """Mock function for subprocess.run to simulate command execution."""
         # check that the extra arguments are in the command list
         assert "--jobs" in command
         assert "4" in command
-        return subprocess.CompletedProcess(command, 0, stdout="", stderr="")
+        return subprocess.CompletedProcess(command, 0, stdout=b"", stderr=b"")
 
     # replace subprocess.run with our mock function during the test
     monkeypatch.setattr(subprocess, "run", mock_subprocess_run)
 
     # call run_make with extra_args set to ['--jobs', '4']
-    run_make("build", extra_args=["--jobs", "4"])
+    run_make(
+        "build",
+        extra_args=["--jobs", "4"],
+        cwd=tmp_path,
+        makefile_path=FAKE_MAKEFILE_PATH,
+    )
+
+
+# dry-run probes by test id: (target, extra args, expected, unexpected output)
+DRY_RUN_CASES: Dict[
+    str, Tuple[str, Tuple[str, ...], Tuple[bytes, ...], Tuple[bytes, ...]]
+] = {
+    "check-docker": ("check-docker", (), (b"docker --version",), ()),
+    "check-deps-notty-undefined": ("check-deps", (), (b"-it",), ()),
+    "check-deps-notty-true": ("check-deps", ("NOTTY=true",), (b"-i",), (b"-it",)),
+    "check-deps-notty-false": ("check-deps", ("NOTTY=false",), (b"-it",), ()),
+    "build-no-options": (
+        "build",
+        (),
+        (b"docker pull", b"docker build"),
+        (b"--no-cache",),
+    ),
+    "build-nocache": (
+        "build",
+        ("DCKR_NOCACHE=true",),
+        (b"docker pull", b"docker build", b"--no-cache"),
+        (),
+    ),
+    "build-no-pull": (
+        "build",
+        ("DCKR_PULL=false",),
+        (b"docker build",),
+        (b"docker pull", b"--no-cache"),
+    ),
+    "pytest-use-vol-default": ("pytest", (), (b"-v",), ()),
+    "pytest-use-usr-default": ("pytest", (), (b"--user",), ()),
+    "pytest-use-usr-off": ("pytest", ("USE_USR=false",), (), (b"--user",)),
+}
 
 
 @pytest.mark.make
-def test_check_docker_dry_run() -> None:
-    """Test `check-docker` make target executes the expected command."""
-    result = run_make("check-docker", dry_mode=True)
+@pytest.mark.parametrize(
+    "expect_in,expect_out",
+    [
+        pytest.param(
+            expect_in,
+            expect_out,
+            id=name,
+            marks=pytest.mark.make_probe(target, True, extra_args),
+        )
+        for name, (target, extra_args, expect_in, expect_out) in DRY_RUN_CASES.items()
+    ],
+)
+def test_dry_run_output(
+    make_probe_result: MakeResult,
+    expect_in: Tuple[bytes, ...],
+    expect_out: Tuple[bytes, ...],
+) -> None:
+    """Test that dry runs of a target include/exclude the expected flags."""
+    # output of the dry run declared by the case's make_probe marker
+    result = make_probe_result
 
-    # verify that the expected command appears in the dry run output
-    assert "docker --version" in result.stdout
+    # check exit value
     assert result.returncode == 0
 
+    # check expected command fragments are present
+    for fragment in expect_in:
+        assert fragment in result.stdout, f"{fragment!r} missing from dry run"
 
-@pytest.mark.make
-def test_check_deps_tests_without_notty_defined() -> None:
-    """Test that NOTTY is correctly handled when not set."""
-    result = run_make("check-deps", dry_mode=True)
-    assert result.returncode == 0
-    assert "-it" in result.stdout  # Ensure -it is included
+    # check unwanted command fragments are absent
+    for fragment in expect_out:
+        assert fragment not in result.stdout, f"{fragment!r} found in dry run"
 
 
 @pytest.mark.make
-def test_check_deps_tests_with_notty() -> None:
-    """Test that NOTTY is correctly handled in check-deps-tests."""
-    result = run_make("check-deps", extra_args=["NOTTY=true"], dry_mode=True)
-    assert result.returncode == 0
-    assert "-i" in result.stdout
-    assert "-it" not in result.stdout  # Ensure -it is not included
+@pytest.mark.make_probe("pytest", True, ("USE_VOL=false",))
+def test_use_vol_off(current_directory: Path, make_probe_result: MakeResult) -> None:
+    """Test that volume is not mounted with USE_VOL=false."""
+    # output of the make run declared by the test's make_probe marker
+    result = make_probe_result
 
-
-@pytest.mark.make
-def test_check_deps_tests_without_notty() -> None:
-    """Test that NOTTY is correctly handled when false."""
-    result = run_make("check-deps", extra_args=["NOTTY=false"], dry_mode=True)
+    # assert that the volume flag "-v" and host dir are absent from the result
     assert result.returncode == 0
-    assert "-it" in result.stdout  # Ensure -it is included
-
-
-@pytest.mark.make
-def test_build_tests_no_options() -> None:
-    """Test build target without DCKR_PULL or DCKR_NOCACHE options."""
-    result = run_make("build", dry_mode=True)
-
-    # Check that docker pull/build is in command, but no --no-cache flag
-    assert "docker pull" in result.stdout
-    assert "docker build" in result.stdout
-    assert "--no-cache" not in result.stdout
-
-
-@pytest.mark.make
-def test_build_tests_with_nocache() -> None:
-    """Test the build target with DCKR_NOCACHE option."""
-    result = run_make("build", dry_mode=True, extra_args=["DCKR_NOCACHE=true"])
-
-    # Check that --no-cache flag is passed to docker build
-    assert "docker build" in result.stdout
-    assert "--no-cache" in result.stdout
-    assert "docker pull" in result.stdout
-
-
-@pytest.mark.make
-def test_build_tests_with_no_pull() -> None:
-    """Test build target with no DCKR_PULL."""
-    result = run_make("build", dry_mode=True, extra_args=["DCKR_PULL=false"])
-
-    # check that docker pull not included in the output
-    assert "docker pull" not in result.stdout
-    assert "docker build" in result.stdout
-    assert "--no-cache" not in result.stdout
-
-
-@pytest.mark.make
-def test_use_vol_default() -> None:
-    """Test that volume is mounted by default."""
-    # run the make command with default environment (USE_VOL=true)
-    result = run_make("pytest", dry_mode=True)
-
-    # assert that the expected flag "-v" is present in the result
-    assert result.returncode == 0
-    assert "-v" in result.stdout
-
-
-@pytest.mark.make
-def test_use_vol_off(current_directory: Path) -> None:
-    """Test that volume is mounted by default."""
-    # run the make command with default environment (USE_VOL=true)
-    result = run_make("pytest", dry_mode=True, extra_args=["USE_VOL=false"])
-
-    # assert that the expected flag "-v" is present in the result
-    assert result.returncode == 0
-    assert "-v" not in result.stdout
-    assert str(current_directory) not in result.stdout
-
-
-@pytest.mark.make
-def test_use_usr_default() -> None:
-    """Test that `--user` is enabled by default in the Makefile."""
-    # Run the make command with default environment (USE_USR=true)
-    result = run_make("pytest", dry_mode=True)
-
-    # Assert that the expected flag "-u" is present in the result
-    assert "--user" in result.stdout
-
-
-@pytest.mark.make
-def test_use_usr_off() -> None:
-    """Test that `--user` is missing with USE_USR=false."""
-    # Run the make command with default environment (USE_USR=true)
-    result = run_make("pytest", dry_mode=True, extra_args=["USE_USR=false"])
-
-    # Assert that the expected flag "-u" is present in the result
-    assert "--user" not in result.stdout
+    assert b"-v" not in result.stdout
+    assert bytes(current_directory) not in result.stdout
 
 
 @pytest.mark.make